@@ -159,7 +159,7 @@ class App():
                 self.display.set_scroll_text(scroll_text)
                 self.display.set_action_image('cartridge')
             else:
-                self.audio.stop_song()
+                self.audio.stop_playlist()
                 self.display.set_rfid(uid)
                 self.display.set_scroll_text('')
         elif self.active_rfid_uid != 'EMPTY':
@@ -208,7 +208,7 @@ class App():
             print('.', end="", flush=True)
             if time.time() - self.last_rfid_scan > 3:
                 # reset music, wait for next cartridge
-                self.audio.stop_song()
+                self.audio.stop_playlist()
                 self.active_rfid_uid = 'EMPTY'
                 print('EMPTY')
                 self.display.set_scroll_text('')
@@ -216,6 +216,7 @@ class App():
         volume = self.normalized_volume(self.volume_pot.value)
         self.audio.set_volume(volume)
         self.display.set_volume(volume)
+        self.display.set_audio_levels(self.audio.get_audio_levels())
 
         self.display.loop()
         self.audio.loop()
@@ -0,0 +1,112 @@
+import os
+from PIL import Image, ImageFont
+
+# The ST7789 takes RGB frames, so everything is converted to this up front
+WORKING_MODE = 'RGB'
+
+
+class OverlayAsset:
+    def __init__(self, image, mask, offset):
+        # RGB pixels and alpha mask cropped to the visible bounding box, and
+        # where that box sits on the full size canvas
+        self.image = image
+        self.mask = mask
+        self.offset = offset
+
+    def paste_onto(self, canvas):
+        # single pass blend of only the visible pixels, no per frame
+        # RGBA conversion
+        canvas.paste(self.image, self.offset, self.mask)
+
+    def memory_footprint(self):
+        return image_bytes(self.image) + image_bytes(self.mask)
+
+
+class FontAsset:
+    def __init__(self, path, size):
+        self.path = path
+        self.size = size
+        self.font = ImageFont.truetype(path, size)
+
+    def memory_footprint(self):
+        # FreeType doesn't report its own allocations, file size is the
+        # best estimate we have
+        return os.path.getsize(self.path)
+
+
+def image_bytes(image):
+    # all working modes used here are 8 bits per band
+    width, height = image.size
+    return width * height * len(image.getbands())
+
+
+class AssetManager:
+    def __init__(self, image_dir, font_dir):
+        self.image_dir = image_dir
+        self.font_dir = font_dir
+        self.images = {}
+        self.overlays = {}
+        self.fonts = {}
+
+    def open_image(self, name):
+        with Image.open(self.image_dir + '/' + name + '.png') as image:
+            image.load()
+            return image
+
+    # full frame images (backgrounds), loaded on first use
+    def get_image(self, name):
+        if name not in self.images:
+            image = self.open_image(name)
+            if image.mode != WORKING_MODE:
+                image = image.convert(WORKING_MODE)
+            self.images[name] = image
+        return self.images[name]
+
+    # transparent images drawn over the canvas, loaded on first use
+    def get_overlay(self, name):
+        if name not in self.overlays:
+            image = self.open_image(name).convert('RGBA')
+            mask = image.getchannel('A')
+            box = mask.getbbox()
+            if box is None:
+                # fully transparent, keep a single invisible pixel
+                box = (0, 0, 1, 1)
+            self.overlays[name] = OverlayAsset(
+                image.crop(box).convert(WORKING_MODE),
+                mask.crop(box),
+                (box[0], box[1])
+            )
+        return self.overlays[name]
+
+    def get_font(self, name, size):
+        key = (name, size)
+        if key not in self.fonts:
+            self.fonts[key] = FontAsset(
+                self.font_dir + '/' + name + '.ttf',
+                size
+            )
+        return self.fonts[key].font
+
+    # bytes used per loaded asset, for diagnostics
+    def memory_footprint(self):
+        footprint = {}
+        for name, image in self.images.items():
+            footprint['image:' + name] = image_bytes(image)
+        for name, overlay in self.overlays.items():
+            footprint['overlay:' + name] = overlay.memory_footprint()
+        for (name, size), font in self.fonts.items():
+            footprint['font:' + name + ':' + str(size)] = (
+                font.memory_footprint()
+            )
+        return footprint
+
+
+shared_asset_managers = {}
+
+
+# one manager per asset location so all components share loaded assets
+def get_asset_manager(image_dir, font_dir):
+    key = (image_dir, font_dir)
+    if key not in shared_asset_managers:
+        shared_asset_managers[key] = AssetManager(image_dir, font_dir)
+    return shared_asset_managers[key]
@@ -1,6 +1,8 @@
 import pygame
 import os
 import math
+from spectrum_analyzer import SpectrumAnalyzer
+from playlist_prefetcher import PlaylistPrefetcher
 
 
 class AudioPlayer:
@@ -19,6 +21,7 @@ class AudioPlayer:
             'items': []
         }
         self.playlist_index = 0
+        self.loaded_file = ''
         self.paused = False
 
         # Prevent pygame from displaying game window in terminal, run headless
@@ -31,21 +34,43 @@ class AudioPlayer:
         self.music_end_event = pygame.USEREVENT + 1
         pygame.mixer.music.set_endevent(self.music_end_event)
 
+        # band levels for audio reactive visuals, analyzed off the main loop
+        self.spectrum = SpectrumAnalyzer()
+
+        # warms upcoming songs into the page cache so next_song isn't a
+        # cold read from the SD card
+        self.prefetcher = PlaylistPrefetcher(audio_dir=self.audio_dir)
+
     def set_playlist(self, playlist_data):
         self.playlist_data = playlist_data
         self.playlist_index = 0
         self.paused = False
+        # the first song is read cold, don't let prefetching compete with it
+        self.prefetcher.cancel()
         self.load_song(playlist_data['items'][self.playlist_index]['file'])
         self.play_song()
+        self.prefetcher.start(playlist_data, self.playlist_index)
 
     def load_song(self, fileName):
         try:
             pygame.mixer.music.load(self.audio_dir + '/' + fileName)
+            # restarting the same song isn't a cache lookup worth counting
+            if fileName != self.loaded_file:
+                self.prefetcher.record_load(fileName)
+            self.loaded_file = fileName
+            self.spectrum.analyze_file(self.audio_dir + '/' + fileName)
             if self.on_load_song:
                 self.on_load_song()
         except pygame.error as e:
             print('error loading song')
             print(e)
+        self.prefetcher.advance(self.playlist_index)
+
+    # cartridge removed or unknown, stop playing and stop prefetching its
+    # playlist
+    def stop_playlist(self):
+        self.stop_song()
+        self.prefetcher.cancel()
 
     def play_song(self):
         pygame.mixer.music.play()
@@ -118,6 +143,13 @@ class AudioPlayer:
 
         pygame.mixer.music.set_volume(eased_volume * self.max_volume)
 
+    # (bass, mid, treble) levels at the current playback position, or None
+    # when nothing is playing or the song hasn't been analyzed that far yet
+    def get_audio_levels(self):
+        if self.paused or not pygame.mixer.music.get_busy():
+            return None
+        return self.spectrum.levels_at(pygame.mixer.music.get_pos())
+
     def loop(self):
         for event in pygame.event.get():
             if event.type == self.music_end_event:
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# Frame times of the audio reactive warp effect while a song is analyzed in
+# the background. Run on the Pi with a real song (an mp3 exercises the
+# ffmpeg decoder), or without one to use a generated 4 minute wav:
+# python bench_spectrum.py [song file]
+
+import os
+import sys
+import tempfile
+import time
+import wave
+import numpy as np
+import pygame
+from PIL import Image, ImageDraw
+from pil_warp_speed import PilWarpSpeed
+from spectrum_analyzer import SpectrumAnalyzer
+
+SAMPLE_RATE = 44100
+SONG_SECONDS = 240
+IDLE_FRAMES = 150
+FRAME_TIME = 1 / 30
+COLOR = (255, 0, 152)
+
+
+def write_song(path):
+    # stereo int16 noise with a pulsing bass tone, written a second at a time
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(2)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        t = np.arange(SAMPLE_RATE) / SAMPLE_RATE
+        for second in range(SONG_SECONDS):
+            bass = np.sin(2 * np.pi * 60 * t) * (np.sin(2 * np.pi * 2 * t) > 0)
+            noise = np.random.uniform(-0.2, 0.2, len(t))
+            mono = ((0.6 * bass + noise) * 32767).astype(np.int16)
+            wav.writeframes(np.stack((mono, mono), axis=1).tobytes())
+
+
+# one display frame's worth of audio reactive work, paced like the app
+def run_frame(warp, analyzer, draw):
+    start = time.perf_counter()
+    position_ms = pygame.mixer.music.get_pos()
+    warp.set_audio_levels(analyzer.levels_at(position_ms))
+    warp.loop()
+    warp.draw(draw, COLOR)
+    frame_time = time.perf_counter() - start
+    if frame_time < FRAME_TIME:
+        time.sleep(FRAME_TIME - frame_time)
+    return frame_time * 1000
+
+
+def report(label, frame_times):
+    frame_times = np.array(frame_times)
+    print('{}: {} frames, mean {:.3f}ms, p99 {:.3f}ms, worst {:.3f}ms'.format(
+        label,
+        len(frame_times),
+        frame_times.mean(),
+        np.percentile(frame_times, 99),
+        frame_times.max()
+    ))
+
+
+def main():
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.init()
+
+    if len(sys.argv) > 1:
+        song = sys.argv[1]
+        temp_dir = None
+    else:
+        temp_dir = tempfile.TemporaryDirectory()
+        song = temp_dir.name + '/bench.wav'
+        write_song(song)
+
+    pygame.mixer.music.load(song)
+    pygame.mixer.music.play()
+
+    analyzer = SpectrumAnalyzer()
+    warp = PilWarpSpeed(star_count=30, warp_speed_amount=0.02)
+    canvas = Image.new('RGB', (240, 240))
+    draw = ImageDraw.Draw(canvas)
+
+    idle = [run_frame(warp, analyzer, draw) for frame in range(IDLE_FRAMES)]
+    report('idle', idle)
+
+    analyzing = []
+    start = time.perf_counter()
+    analyzer.analyze_file(song)
+    while analyzer.is_busy():
+        analyzing.append(run_frame(warp, analyzer, draw))
+    analyze_seconds = time.perf_counter() - start
+    report('analyzing', analyzing)
+    print('analysis finished in {:.2f}s, {} windows'.format(
+        analyze_seconds,
+        analyzer.published[3]
+    ))
+
+    pygame.mixer.music.stop()
+    if temp_dir:
+        temp_dir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
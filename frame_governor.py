@@ -0,0 +1,58 @@
+import time
+from collections import deque
+
+
+class FrameGovernor:
+    def __init__(
+            self,
+            target_frame_time=1 / 30,
+            max_level=3,
+            sample_count=20,
+            headroom=0.7,
+            ):
+        # level 0 is full quality, each level above that sheds more work
+        self.target_frame_time = target_frame_time
+        self.max_level = max_level
+        self.headroom = headroom
+        self.level = 0
+        self.frame_times = deque(maxlen=sample_count)
+        self.frame_start = None
+
+    def start_frame(self):
+        self.frame_start = time.perf_counter()
+
+    # returns True when the quality level changed this frame
+    def end_frame(self):
+        if self.frame_start is None:
+            return False
+        self.frame_times.append(time.perf_counter() - self.frame_start)
+        self.frame_start = None
+
+        # wait for a full window so one slow frame doesn't flip levels,
+        # and start over after each change to measure the new level
+        if len(self.frame_times) < self.frame_times.maxlen:
+            return False
+
+        average = self.average_frame_time()
+        if average > self.target_frame_time and self.level < self.max_level:
+            self.level += 1
+        elif (average < self.target_frame_time * self.headroom and
+                self.level > 0):
+            self.level -= 1
+        else:
+            return False
+
+        self.frame_times.clear()
+        return True
+
+    def average_frame_time(self):
+        if len(self.frame_times) == 0:
+            return 0.0
+        return sum(self.frame_times) / len(self.frame_times)
+
+    def diagnostics(self):
+        return {
+            'level': self.level,
+            'average_frame_time': self.average_frame_time(),
+            'target_frame_time': self.target_frame_time,
+        }
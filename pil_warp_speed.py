@@ -1,5 +1,9 @@
 from random import randrange, random
 
+# star brightness with no treble, also used before levels are available so
+# stars don't jump when analysis catches up
+QUIET_STAR_BRIGHTNESS = 0.7
+
 
 class Star:
     def __init__(
@@ -96,11 +100,18 @@ class PilWarpSpeed:
         self.canvas_width = canvas_width
         self.canvas_height = canvas_height
         self.warp_speed_amount = warp_speed_amount
+        self.base_warp_speed_amount = warp_speed_amount
         self.throttle_frames = throttle_frames
         self.throttle_frame = 0
+        # audio reactive state, smoothed so visuals don't flicker
+        self.bass = 0.0
+        self.treble = 0.0
+        self.star_brightness = QUIET_STAR_BRIGHTNESS
         self.stars = self.create_stars()
+        self.active_star_count = star_count
         self.include_polygons = include_polygons
         self.polygon_spawn_every = 50
+        self.base_polygon_spawn_every = self.polygon_spawn_every
         self.polygon_spawn_i = 0
         self.polygons = []
         self.fast_forward()
@@ -150,12 +161,54 @@ class PilWarpSpeed:
             self.throttle_frame = 0
             return False
 
-    def loop(self):
-        for polygon in self.polygons:
-            polygon.update_position()
-        self.cleanup_polygons()
-        self.create_polygon()
+    def set_quality(
+            self,
+            active_star_count,
+            include_polygons,
+            throttle_frames
+            ):
+        self.active_star_count = min(active_star_count, self.star_count)
+        self.include_polygons = include_polygons
+        if not include_polygons:
+            self.polygons = []
+        self.throttle_frames = throttle_frames
+        self.throttle_frame = 0
+
+    # levels: (bass, mid, treble) from 0.0 to 1.0, or None without music
+    def set_audio_levels(self, levels):
+        if levels is None:
+            bass = 0.0
+            treble = 0.0
+        else:
+            bass = float(levels[0])
+            treble = float(levels[-1])
+
+        # jump up on a beat, fall back gently
+        self.bass = max(bass, self.bass * 0.85)
+        self.treble = max(treble, self.treble * 0.8)
+
+        self.warp_speed_amount = (
+            self.base_warp_speed_amount * (1.0 + 2.0 * self.bass)
+        )
         for star in self.stars:
+            star.warp_speed_amount = self.warp_speed_amount
+        for polygon in self.polygons:
+            polygon.warp_speed_amount = self.warp_speed_amount
+        self.polygon_spawn_every = max(
+            1,
+            round(self.base_polygon_spawn_every * (1.0 - 0.6 * self.bass))
+        )
+        self.star_brightness = (
+            QUIET_STAR_BRIGHTNESS + (1.0 - QUIET_STAR_BRIGHTNESS) * self.treble
+        )
+
+    def loop(self):
+        if self.include_polygons:
+            for polygon in self.polygons:
+                polygon.update_position()
+            self.cleanup_polygons()
+            self.create_polygon()
+        for star in self.stars[:self.active_star_count]:
             star.update_position()
 
     def draw(self, image_draw, color):
@@ -176,7 +229,8 @@ class PilWarpSpeed:
                 ),
                 width=4
             )
-        for star in self.stars:
+        for star in self.stars[:self.active_star_count]:
+            brightness = star.brightness * self.star_brightness
             image_draw.rectangle(
                 (
                     star.pos_x,
@@ -184,8 +238,8 @@ class PilWarpSpeed:
                     star.pos_x + (self.star_size * star.brightness),
                     star.pos_y + (self.star_size * star.brightness)),
                 (
-                    round(color[0] * star.brightness),
-                    round(color[1] * star.brightness),
-                    round(color[2] * star.brightness)
+                    round(color[0] * brightness),
+                    round(color[1] * brightness),
+                    round(color[2] * brightness)
                 )
             )
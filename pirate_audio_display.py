@@ -1,9 +1,11 @@
 #!/usr/bin/env python
 # Thanks: https://github.com/pimoroni/pirate-audio/tree/master/examples
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import ImageDraw
 from ST7789 import ST7789
 from pil_warp_speed import PilWarpSpeed
+from asset_manager import get_asset_manager
+from frame_governor import FrameGovernor
 
 SCREEN_WIDTH = 240
 SCREEN_HEIGHT = 240
@@ -11,6 +13,19 @@ SCREEN_HEIGHT = 240
 COLOR_VOLUME_BAR = (255, 0, 152)
 COLOR_RFID_LABEL = (255, 222, 243)
 
+ACTION_IMAGES = ('play', 'pause', 'next', 'previous', 'cartridge')
+
+WARP_STAR_COUNT = 30
+
+# warp effect settings per governor level, lowest quality last:
+# (active star count, include polygons, throttle frames)
+WARP_QUALITY_LEVELS = (
+    (WARP_STAR_COUNT, True, 0),
+    (WARP_STAR_COUNT // 2, True, 0),
+    (WARP_STAR_COUNT // 2, False, 0),
+    (WARP_STAR_COUNT // 3, False, 1),
+)
+
 
 class PirateAudioDisplay:
     def __init__(self, font_dir, image_dir, rotation=90, spi_speed_mhz=80):
@@ -19,18 +34,10 @@ class PirateAudioDisplay:
         self.rotation = rotation
         self.spi_speed_mhz = spi_speed_mhz
         self.run = True
+        self.assets = get_asset_manager(self.image_dir, self.font_dir)
 
-        self.image_canvas = Image.open(
-            self.image_dir + '/stephans_quintet.png'
-            )
-        self.image_background = Image.open(
-            self.image_dir + '/stephans_quintet.png'
-            )
-        self.image_play = Image.open(self.image_dir + '/play.png')
-        self.image_pause = Image.open(self.image_dir + '/pause.png')
-        self.image_next = Image.open(self.image_dir + '/next.png')
-        self.image_previous = Image.open(self.image_dir + '/previous.png')
-        self.image_cartridge = Image.open(self.image_dir + '/cartridge.png')
+        self.image_background = self.assets.get_image('stephans_quintet')
+        self.image_canvas = self.image_background.copy()
         self.draw = ImageDraw.Draw(self.image_canvas)
 
         self.image_action = None
@@ -40,15 +47,12 @@ class PirateAudioDisplay:
         self.scroll_text = ''
         self.scroll_text_x = 280
         self.scroll_text_y = 100
-        self.scroll_text_font = ImageFont.truetype(
-            self.font_dir + '/rainyhearts.ttf',
-            40
-        )
+        self.scroll_text_font = self.assets.get_font('rainyhearts', 40)
         self.scroll_text_speed = 3
 
         # init warp speed background effect
         self.warp_speed_effect = PilWarpSpeed(
-            star_count=30,
+            star_count=WARP_STAR_COUNT,
             star_size=8,
             include_polygons=True,
             warp_speed_amount=0.02,
@@ -56,6 +60,10 @@ class PirateAudioDisplay:
             canvas_height=240,
             throttle_frames=0
         )
+        self.frame_governor = FrameGovernor(
+            target_frame_time=1 / 30,
+            max_level=len(WARP_QUALITY_LEVELS) - 1
+        )
 
         # init screen
         self.st7789 = ST7789(
@@ -76,11 +84,7 @@ class PirateAudioDisplay:
         self.rfid_uid = ""
         self.rfid_show_for = 100
         self.rfid_show_int = 0
-        # TODO: Define this elsewhere
-        self.rfid_font = ImageFont.truetype(
-            self.font_dir + '/rainyhearts.ttf',
-            36
-        )
+        self.rfid_font = self.assets.get_font('rainyhearts', 36)
 
     def set_scroll_text(self, text):
         self.scroll_text = text
@@ -113,27 +117,19 @@ class PirateAudioDisplay:
             self.volume = normalizedVolume
             self.volume_show_int = 0
 
+    # band levels from the audio player, None when nothing is playing
+    def set_audio_levels(self, levels):
+        self.warp_speed_effect.set_audio_levels(levels)
+
     def draw_action_image(self):
         if self.image_action_i > 0 and self.image_action:
             self.image_action_i -= 1
 
-            self.image_canvas.paste(
-                self.image_action,
-                (0, 0),
-                self.image_action
-            )
+            self.image_action.paste_onto(self.image_canvas)
 
     def set_action_image(self, image_name):
-        if image_name == 'cartridge':
-            self.image_action = self.image_cartridge
-        if image_name == 'play':
-            self.image_action = self.image_play
-        elif image_name == 'pause':
-            self.image_action = self.image_pause
-        elif image_name == 'next':
-            self.image_action = self.image_next
-        elif image_name == 'previous':
-            self.image_action = self.image_previous
+        if image_name in ACTION_IMAGES:
+            self.image_action = self.assets.get_overlay(image_name)
 
         self.image_action_i = self.image_action_show_for
 
@@ -170,16 +166,34 @@ class PirateAudioDisplay:
                 )
             self.rfid_show_int = self.rfid_show_int + 1
 
+    def apply_quality_level(self):
+        active_star_count, include_polygons, throttle_frames = (
+            WARP_QUALITY_LEVELS[self.frame_governor.level]
+        )
+        self.warp_speed_effect.set_quality(
+            active_star_count,
+            include_polygons,
+            throttle_frames
+        )
+
+    # current effect quality level and recent frame times, for diagnostics
+    def get_quality_diagnostics(self):
+        return self.frame_governor.diagnostics()
+
     def render_screen(self):
         self.st7789.display(self.image_canvas)
 
     def loop(self):
         if self.run is True:
+            self.frame_governor.start_frame()
             self.image_canvas.paste(self.image_background, (0, 0))
-            self.warp_speed_effect.loop()
+            if not self.warp_speed_effect.throttle_animation():
+                self.warp_speed_effect.loop()
             self.warp_speed_effect.draw(self.draw, COLOR_VOLUME_BAR)
             self.draw_rfid()
             self.draw_volume()
             self.draw_action_image()
             self.draw_scroll_text()
             self.render_screen()
+            if self.frame_governor.end_frame():
+                self.apply_quality_level()
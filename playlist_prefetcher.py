@@ -0,0 +1,137 @@
+import os
+import threading
+import time
+
+
+class PlaylistPrefetcher:
+    def __init__(
+            self,
+            audio_dir,
+            window_size=3,
+            chunk_size=256 * 1024,
+            io_budget_bytes_per_second=8 * 1024 * 1024
+            ):
+        # keep the next window_size songs in the OS page cache, reading no
+        # faster than the budget so the playing song isn't starved on SD
+        self.audio_dir = audio_dir
+        self.window_size = window_size
+        self.chunk_size = chunk_size
+        self.io_budget_bytes_per_second = io_budget_bytes_per_second
+
+        self.files = []
+        self.playlist_index = 0
+        self.generation = 0
+        self.warmed = set()
+        self.hits = 0
+        self.misses = 0
+
+        self.wake = threading.Event()
+        self.worker = None
+
+    # new cartridge, drop whatever was being prefetched and start over
+    def start(self, playlist_data, playlist_index=0):
+        self.generation += 1
+        self.files = [item['file'] for item in playlist_data['items']]
+        self.playlist_index = playlist_index
+        self.warmed = set()
+        if self.worker is None:
+            self.worker = threading.Thread(target=self.run, daemon=True)
+            self.worker.start()
+        self.wake.set()
+
+    # slide the window along with the playlist
+    def advance(self, playlist_index):
+        self.playlist_index = playlist_index
+        # songs that left the window may have been evicted since, so they
+        # no longer count as warm
+        self.warmed.intersection_update(self.upcoming_files())
+        self.wake.set()
+
+    def cancel(self):
+        self.generation += 1
+        self.files = []
+        self.warmed = set()
+
+    # count whether a newly loaded song was in the warm window
+    def record_load(self, file_name):
+        if file_name in self.warmed:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'warmed': len(self.warmed),
+        }
+
+    def upcoming_files(self):
+        files = self.files
+        upcoming = []
+        # wraps around like AudioPlayer.next_song
+        for offset in range(1, self.window_size + 1):
+            if len(files) == 0:
+                break
+            file_name = files[(self.playlist_index + offset) % len(files)]
+            if file_name not in upcoming:
+                upcoming.append(file_name)
+        return upcoming
+
+    def run(self):
+        while True:
+            self.wake.wait()
+            self.wake.clear()
+            generation = self.generation
+            warmed = self.warmed
+            for file_name in self.upcoming_files():
+                if generation != self.generation:
+                    break
+                if file_name in warmed:
+                    continue
+                if (self.warm_file(file_name, generation) and
+                        file_name in self.upcoming_files()):
+                    warmed.add(file_name)
+
+    def hint_chunk(self, fd, offset):
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(
+                fd,
+                offset,
+                self.chunk_size,
+                os.POSIX_FADV_WILLNEED
+            )
+
+    def warm_file(self, file_name, generation):
+        try:
+            fd = os.open(self.audio_dir + '/' + file_name, os.O_RDONLY)
+        except OSError as e:
+            print('error prefetching song')
+            print(e)
+            return False
+
+        try:
+            offset = 0
+            self.hint_chunk(fd, offset)
+            # read through so the whole file really is cached
+            while True:
+                if generation != self.generation:
+                    return False
+                started = time.monotonic()
+                chunk = os.read(fd, self.chunk_size)
+                if not chunk:
+                    return True
+                offset += len(chunk)
+                # only ask for the next chunk, so the kernel's readahead
+                # stays inside the budget while we wait out this one
+                self.hint_chunk(fd, offset)
+                budget_time = len(chunk) / self.io_budget_bytes_per_second
+                elapsed = time.monotonic() - started
+                if elapsed < budget_time:
+                    time.sleep(budget_time - elapsed)
+        except OSError as e:
+            print('error prefetching song')
+            print(e)
+            return False
+        finally:
+            os.close(fd)
@@ -0,0 +1,250 @@
+import shutil
+import subprocess
+import threading
+import time
+import wave
+from collections import OrderedDict
+import numpy as np
+
+# (low Hz, high Hz) for bass, mid and treble
+BANDS = ((20, 250), (250, 2000), (2000, 16000))
+
+# band energies are mapped from this dB range (0 dB == full scale) to 0..1
+FLOOR_DB = -70.0
+
+# compressed formats are decoded by ffmpeg to mono at this rate
+FFMPEG_SAMPLE_RATE = 44100
+
+WAV_SAMPLE_TYPES = {1: np.uint8, 2: np.int16, 4: np.int32}
+
+
+class SpectrumAnalyzer:
+    def __init__(
+            self,
+            window_size=1024,
+            hop_size=512,
+            batch_windows=64,
+            cache_size=8,
+            bands=BANDS
+            ):
+        self.window_size = window_size
+        self.hop_size = hop_size
+        self.batch_windows = batch_windows
+        self.cache_size = cache_size
+        self.bands = bands
+        self.window = np.hanning(window_size).astype(np.float32)
+        # normalize so a full scale sine lands near 0 dB
+        self.power_scale = 4.0 / (np.sum(self.window) ** 2)
+
+        # The requested song is handed to the worker as one
+        # (generation, path) tuple, and only the worker publishes results as
+        # one (generation, sample_rate, levels, frames_ready) tuple. Swapping
+        # a single reference is atomic, so neither side needs a lock or can
+        # see half of an update.
+        self.request = (0, None)
+        self.published = (0, 0, None, 0)
+
+        # finished analyses by path, so replaying a song costs nothing.
+        # Only touched by the worker.
+        self.cache = OrderedDict()
+        self.busy = False
+        self.wake = threading.Event()
+        self.worker = None
+
+    # analyze in the background, replacing any running analysis
+    def analyze_file(self, path):
+        generation, current_path = self.request
+        if path == current_path:
+            # same song restarted, keep the finished or running analysis
+            return
+        self.request = (generation + 1, path)
+        if self.worker is None:
+            self.worker = threading.Thread(target=self.run, daemon=True)
+            self.worker.start()
+        self.wake.set()
+
+    def is_busy(self):
+        return self.busy or self.wake.is_set()
+
+    # one worker, one analysis in flight, always the latest requested song
+    def run(self):
+        while True:
+            self.wake.wait()
+            self.busy = True
+            self.wake.clear()
+            generation, path = self.request
+            try:
+                if path in self.cache:
+                    self.cache.move_to_end(path)
+                    sample_rate, levels = self.cache[path]
+                    self.published = (
+                        generation,
+                        sample_rate,
+                        levels,
+                        len(levels)
+                    )
+                    continue
+                stream = self.open_stream(path)
+                if stream is None:
+                    continue
+                sample_rate, chunks = stream
+                try:
+                    levels = self.analyze_chunks(
+                        sample_rate,
+                        chunks,
+                        generation
+                    )
+                finally:
+                    chunks.close()
+                if levels is not None:
+                    self.cache[path] = (sample_rate, levels)
+                    while len(self.cache) > self.cache_size:
+                        self.cache.popitem(last=False)
+            except (wave.Error, OSError, ValueError) as e:
+                print('error decoding song for spectrum')
+                print(e)
+            finally:
+                self.busy = False
+
+    def open_stream(self, path):
+        try:
+            wav = wave.open(path, 'rb')
+        except (wave.Error, EOFError, OSError):
+            wav = None
+        if wav is not None:
+            if wav.getsampwidth() in WAV_SAMPLE_TYPES:
+                return wav.getframerate(), self.read_wav(wav)
+            wav.close()
+
+        if shutil.which('ffmpeg') is None:
+            print('ffmpeg not found, no spectrum for ' + path)
+            return None
+        # decoding is background work, nice it so playback and the render
+        # loop win
+        process = subprocess.Popen(
+            [
+                'nice', '-n', '10',
+                'ffmpeg', '-nostdin', '-v', 'quiet', '-i', path,
+                '-f', 's16le', '-ac', '1', '-ar', str(FFMPEG_SAMPLE_RATE), '-'
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        return FFMPEG_SAMPLE_RATE, self.read_ffmpeg(process)
+
+    def chunk_frames(self):
+        return self.batch_windows * self.hop_size
+
+    # yields mono float32 chunks, decoding only a chunk at a time
+    def read_wav(self, wav):
+        try:
+            width = wav.getsampwidth()
+            channels = wav.getnchannels()
+            while True:
+                data = wav.readframes(self.chunk_frames())
+                if not data:
+                    return
+                samples = np.frombuffer(
+                    data,
+                    WAV_SAMPLE_TYPES[width]
+                ).reshape(-1, channels).mean(axis=1, dtype=np.float32)
+                if width == 1:
+                    # 8 bit wav is unsigned
+                    samples -= 128.0
+                    samples /= 128.0
+                else:
+                    samples /= float(2 ** (width * 8 - 1))
+                yield samples
+        finally:
+            wav.close()
+
+    def read_ffmpeg(self, process):
+        try:
+            while True:
+                # blocking pipe reads release the GIL while ffmpeg decodes
+                data = process.stdout.read(self.chunk_frames() * 2)
+                if not data:
+                    return
+                samples = np.frombuffer(
+                    data[:len(data) - len(data) % 2],
+                    np.int16
+                ).astype(np.float32)
+                samples /= 32768.0
+                yield samples
+        finally:
+            process.kill()
+            process.stdout.close()
+            process.wait()
+
+    def band_slices(self, sample_rate):
+        freqs = np.fft.rfftfreq(self.window_size, 1.0 / sample_rate)
+        slices = []
+        for low, high in self.bands:
+            start = int(np.searchsorted(freqs, low))
+            end = max(int(np.searchsorted(freqs, high)), start + 1)
+            slices.append((start, min(end, len(freqs))))
+        return slices
+
+    # returns all band levels, or None if a new song replaced this one
+    def analyze_chunks(self, sample_rate, chunks, generation):
+        slices = self.band_slices(sample_rate)
+        levels = np.zeros((1024, len(self.bands)), dtype=np.float32)
+        frames_ready = 0
+        pending = np.zeros(0, dtype=np.float32)
+
+        for chunk in chunks:
+            if generation != self.request[0]:
+                # a new song was loaded, drop this one
+                return None
+            pending = np.concatenate((pending, chunk))
+            count = (len(pending) - self.window_size) // self.hop_size + 1
+            if count <= 0:
+                continue
+
+            # every overlapping window in the batch goes through one FFT call
+            frames = np.lib.stride_tricks.sliding_window_view(
+                pending,
+                self.window_size
+            )[::self.hop_size]
+            spectrum = np.fft.rfft(frames * self.window, axis=1)
+            power = spectrum.real ** 2 + spectrum.imag ** 2
+
+            if frames_ready + count > len(levels):
+                # the reader may still hold the old array, so copy into a
+                # new one instead of resizing in place
+                grown = np.zeros(
+                    (max(len(levels) * 2, frames_ready + count),
+                     len(self.bands)),
+                    dtype=np.float32
+                )
+                grown[:frames_ready] = levels[:frames_ready]
+                levels = grown
+            for band, (low, high) in enumerate(slices):
+                energy = power[:, low:high].sum(axis=1) * self.power_scale
+                db = 10.0 * np.log10(energy + 1e-12)
+                levels[frames_ready:frames_ready + count, band] = np.clip(
+                    (db - FLOOR_DB) / -FLOOR_DB, 0.0, 1.0
+                )
+            frames_ready += count
+            # keep the overlap for the next chunk's first window
+            pending = pending[count * self.hop_size:]
+
+            self.published = (generation, sample_rate, levels, frames_ready)
+            # give the render loop a turn between batches
+            time.sleep(0)
+
+        if generation != self.request[0]:
+            return None
+        return levels[:frames_ready]
+
+    # band levels (0.0 to 1.0) at a playback position, None if not analyzed
+    def levels_at(self, position_ms):
+        generation, sample_rate, levels, frames_ready = self.published
+        if generation != self.request[0] or position_ms < 0:
+            return None
+        # window i is centered on sample i * hop + window / 2
+        position = position_ms * sample_rate / 1000 - self.window_size / 2
+        index = max(0, int(round(position / self.hop_size)))
+        if index >= frames_ready:
+            return None
+        return levels[index]